@@ -1,25 +1,25 @@
+import os
 import re
+import platform
+import importlib.util
+import sys
+import argparse
 import time
 import ssl
+import warnings
 from io import StringIO
+from functools import lru_cache
 from pathlib import Path
 from typing import List, Tuple, Dict, Optional
 
-import certifi
 import tkinter as tk
 from tkinter import filedialog, messagebox, ttk
 
 import numpy as np
 import pandas as pd
 
-import matplotlib
-matplotlib.use("TkAgg")
-
-from matplotlib.figure import Figure
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-from matplotlib.backends.backend_pdf import PdfPages
-
-from Bio import Entrez, SeqIO
+HAS_HYPERSCAN = importlib.util.find_spec("hyperscan") is not None
+HAS_NUMBA = importlib.util.find_spec("numba") is not None
 
 
 # =========================
@@ -28,6 +28,21 @@ from Bio import Entrez, SeqIO
 
 VALID_DNA = set("ACGTN")
 
+DNA_LUT = np.zeros(256, dtype=bool)
+DNA_LUT[np.frombuffer(b"ACGTN", dtype=np.uint8)] = True
+
+DNA_UPPER = bytes.maketrans(b"acgtn", b"ACGTN")
+DNA_DROP = b" \t\r\n"
+
+DNA_2BIT = np.zeros(256, dtype=np.uint8)
+DNA_2BIT[np.frombuffer(b"ACGT", dtype=np.uint8)] = np.arange(4, dtype=np.uint8)
+BASES_PER_WORD = 32
+SWAR_WIDTH = 8
+CHUNKS_PER_CPU = 4
+MOTIF_CACHE_SIZE = 32
+PACKED_CACHE_SIZE = 2
+SPARSE_HIT_RATIO = 64
+
 SOURCE_FILE = "file"
 SOURCE_NCBI = "ncbi"
 
@@ -48,14 +63,24 @@ FILETYPES_FASTA = [("FASTA/TXT", "*.fasta *.fa *.fna *.txt"), ("All files", "*.*
 # LOGIKA: SEKWENCJE
 # =========================
 
+def validate_dna_bytes(seq_bytes: bytes) -> str:
+    if not seq_bytes:
+        raise ValueError("Sekwencja jest pusta.")
+
+    valid = DNA_LUT[np.frombuffer(seq_bytes, dtype=np.uint8)]
+    if not valid.all():
+        bad = sorted(set(seq_bytes.decode("utf-8", errors="replace").upper()) - VALID_DNA)
+        raise ValueError(f"Niepoprawne znaki w sekwencji: {bad}")
+    return seq_bytes.decode("ascii")
+
+
 def validate_dna(seq: str) -> str:
-    seq = seq.upper().replace(" ", "").replace("\n", "").replace("\r", "")
-    bad = sorted(set(seq) - VALID_DNA)
-    if bad:
+    try:
+        seq_bytes = seq.encode("ascii")
+    except UnicodeEncodeError:
+        bad = sorted(set(seq.upper()) - VALID_DNA - set(DNA_DROP.decode("ascii")))
         raise ValueError(f"Niepoprawne znaki w sekwencji: {bad}")
-    if not seq:
-        raise ValueError("Sekwencja jest pusta.")
-    return seq
+    return validate_dna_bytes(seq_bytes.translate(DNA_UPPER, delete=DNA_DROP))
 
 
 def read_sequence_file(path: str) -> Tuple[str, str, str]:
@@ -66,35 +91,35 @@ def read_sequence_file(path: str) -> Tuple[str, str, str]:
     if not file_path.exists():
         raise ValueError("Plik nie istnieje.")
 
-    text = file_path.read_text(encoding="utf-8").strip()
-    if not text:
-        raise ValueError("Plik jest pusty.")
+    header = None
+    has_header = False
+    buf = bytearray()
 
-    lines = [ln.strip() for ln in text.splitlines() if ln.strip()]
-    if not lines:
-        raise ValueError("Plik nie zawiera danych.")
+    with open(file_path, "rb") as f:
+        for line in f:
+            stripped = line.strip()
 
-    if lines[0].startswith(">"):
-        header = lines[0]
-        seq_parts = []
-        encountered_extra_header = False
+            if header is None:
+                if not stripped:
+                    continue
+                has_header = stripped.startswith(b">")
+                if has_header:
+                    header = stripped.decode("utf-8")
+                    continue
+                header = file_path.name
 
-        for ln in lines[1:]:
-            if ln.startswith(">"):
-                encountered_extra_header = True
-                break
-            seq_parts.append(ln)
+            elif has_header and stripped.startswith(b">"):
+                raise ValueError(
+                    "Plik multi-FASTA nie jest obsługiwany w tej wersji. Użyj pliku z jednym rekordem."
+                )
 
-        if encountered_extra_header:
-            raise ValueError(
-                "Plik multi-FASTA nie jest obsługiwany w tej wersji. Użyj pliku z jednym rekordem."
-            )
+            buf += line.translate(DNA_UPPER, delete=DNA_DROP)
 
-        seq = validate_dna("".join(seq_parts))
-        return file_path.name, header, seq
+    if header is None:
+        raise ValueError("Plik jest pusty.")
 
-    seq = validate_dna("".join(lines))
-    return file_path.name, file_path.name, seq
+    seq = validate_dna_bytes(buf)
+    return file_path.name, header, seq
 
 
 def fetch_sequence_from_ncbi(accession: str, email: str) -> Tuple[str, str, str]:
@@ -104,6 +129,9 @@ def fetch_sequence_from_ncbi(accession: str, email: str) -> Tuple[str, str, str]
     if not accession:
         raise ValueError("Podaj accession ID.")
 
+    import certifi
+    from Bio import Entrez, SeqIO
+
     Entrez.email = email
     ssl_context = ssl.create_default_context(cafile=certifi.where())
 
@@ -143,12 +171,13 @@ def load_sequence(
     accession: str,
     email: str,
     seq_label: str,
-    required: bool = True
+    required: bool = True,
+    file_reader=read_sequence_file
 ) -> Optional[Tuple[str, str, str]]:
     if source_mode == SOURCE_FILE:
         file_path = file_path.strip()
         if file_path:
-            return read_sequence_file(file_path)
+            return file_reader(file_path)
         if required:
             raise ValueError(f"Dla {seq_label} wybrano źródło 'Plik', ale nie wskazano pliku.")
         return None
@@ -184,22 +213,249 @@ def motif_to_regex(motif: str) -> str:
     return "".join("[ACGTN]" if ch == "N" else re.escape(ch) for ch in motif)
 
 
-def find_motif_positions(seq: str, motif: str) -> List[int]:
-    pattern = re.compile(rf"(?=({motif_to_regex(motif)}))")
-    return [m.start() for m in pattern.finditer(seq)]
+@lru_cache(maxsize=MOTIF_CACHE_SIZE)
+def _compile_regex(motif: str) -> re.Pattern:
+    return re.compile(rf"(?=({motif_to_regex(motif)}))")
+
+
+@lru_cache(maxsize=MOTIF_CACHE_SIZE)
+def _compile_hyperscan(motif: str):
+    import hyperscan
+
+    db = hyperscan.Database()
+    db.compile(
+        expressions=[motif_to_regex(motif).encode("ascii")],
+        ids=[0],
+        elements=1,
+        flags=[hyperscan.HS_FLAG_SOM_LEFTMOST]
+    )
+    return db
+
+
+@lru_cache(maxsize=1)
+def max_motif_hits(seq: str, motif: str) -> int:
+    n_starts = max(len(seq) - len(motif) + 1, 0)
+    anchor = max(motif.split("N"), key=len)
+    if not anchor:
+        return n_starts
+    return min(seq.count(anchor) * len(anchor), n_starts)
+
+
+def _find_regex(seq: str, motif: str) -> np.ndarray:
+    matches = _compile_regex(motif).finditer(seq)
+    return np.fromiter((m.start() for m in matches), dtype=np.int64)
+
+
+def _find_hyperscan(seq: str, motif: str) -> np.ndarray:
+    max_hits = max_motif_hits(seq, motif)
+    if max_hits == 0:
+        return np.empty(0, dtype=np.int64)
+
+    db = _compile_hyperscan(motif)
+    positions = np.empty(max_hits, dtype=np.int64)
+    n_found = 0
+
+    def on_match(match_id, start, end, flags, context):
+        nonlocal n_found
+        positions[n_found] = start
+        n_found += 1
+
+    db.scan(seq.encode("ascii"), match_event_handler=on_match)
+    return positions[:n_found]
+
+
+def _find_bytes(seq: str, motif: str) -> np.ndarray:
+    max_hits = max_motif_hits(seq, motif)
+    if max_hits == 0:
+        return np.empty(0, dtype=np.int64)
+
+    positions = np.empty(max_hits, dtype=np.int64)
+    n_found = 0
+
+    i = seq.find(motif)
+    while i >= 0:
+        positions[n_found] = i
+        n_found += 1
+        i = seq.find(motif, i + 1)
+
+    return positions[:n_found]
+
+
+def _find_swar(seq: str, motif: str) -> np.ndarray:
+    seq_bytes = seq.encode("ascii")
+    if len(motif) > len(seq_bytes):
+        return np.empty(0, dtype=np.int64)
+
+    value = np.uint64(int.from_bytes(motif.encode("ascii"), "little"))
+    mask = np.uint64((1 << (8 * len(motif))) - 1)
+
+    padded = seq_bytes + bytes(2 * SWAR_WIDTH)
+    n_words = -(-len(seq_bytes) // SWAR_WIDTH)
+    matches = np.empty((n_words, SWAR_WIDTH), dtype=bool)
+    for offset in range(SWAR_WIDTH):
+        words = np.frombuffer(padded, dtype="<u8", count=n_words, offset=offset)
+        matches[:, offset] = (words & mask) == value
+
+    return np.flatnonzero(matches.ravel())
+
+
+def pack_2bit(seq_bytes: bytes) -> np.ndarray:
+    arr = np.frombuffer(seq_bytes, dtype=np.uint8)
+    n_words = arr.size // BASES_PER_WORD + 2
+
+    codes = np.zeros(n_words * BASES_PER_WORD, dtype=np.uint8)
+    codes[:arr.size] = DNA_2BIT[arr]
+
+    packed = codes[0::4] | (codes[1::4] << 2) | (codes[2::4] << 4) | (codes[3::4] << 6)
+    return packed.view("<u8")
+
+
+@lru_cache(maxsize=PACKED_CACHE_SIZE)
+def _packed_sequence(seq: str) -> np.ndarray:
+    return pack_2bit(seq.encode("ascii"))
+
+
+@lru_cache(maxsize=MOTIF_CACHE_SIZE)
+def _encode_motif_2bit(motif: str) -> Tuple[np.uint64, np.uint64]:
+    value = 0
+    mask = 0
+    for i, ch in enumerate(motif):
+        if ch != "N":
+            value |= "ACGT".index(ch) << (2 * i)
+            mask |= 0b11 << (2 * i)
+    return np.uint64(value), np.uint64(mask)
+
+
+def _find_2bit(seq: str, motif: str) -> np.ndarray:
+    seq_bytes = seq.encode("ascii")
+    last_start = len(seq_bytes) - len(motif)
+    if last_start < 0:
+        return np.empty(0, dtype=np.int64)
+
+    words = _packed_sequence(seq)
+    value, mask = _encode_motif_2bit(motif)
+
+    lo = words[:-1]
+    hi = words[1:]
+    matches = np.empty((lo.size, BASES_PER_WORD), dtype=bool)
+    for offset in range(BASES_PER_WORD):
+        if offset == 0:
+            window = lo
+        else:
+            window = (lo >> np.uint64(2 * offset)) | (hi << np.uint64(64 - 2 * offset))
+        matches[:, offset] = ((window ^ value) & mask) == 0
+
+    positions = np.flatnonzero(matches.ravel())
+    positions = positions[positions <= last_start]
+
+    if b"N" in seq_bytes:
+        is_n = np.frombuffer(seq_bytes, dtype=np.uint8) == ord("N")
+        for i, ch in enumerate(motif):
+            if ch != "N":
+                positions = positions[~is_n[positions + i]]
+
+    return positions
+
+
+def _find_numba(seq: str, motif: str) -> np.ndarray:
+    from numba_kernels import scan_chunks
+
+    seq_bytes = seq.encode("ascii")
+    n_starts = len(seq_bytes) - len(motif) + 1
+    if n_starts <= 0:
+        return np.empty(0, dtype=np.int64)
+
+    n_chunks = min((os.cpu_count() or 1) * CHUNKS_PER_CPU, n_starts)
+    bounds = np.linspace(0, n_starts, n_chunks + 1).astype(np.int64)
+
+    return scan_chunks(
+        np.frombuffer(seq_bytes, dtype=np.uint8),
+        np.frombuffer(motif.encode("ascii"), dtype=np.uint8),
+        bounds
+    )
 
 
-def segment_counts(seq_len: int, positions0: List[int], bin_size: int) -> pd.DataFrame:
+@lru_cache(maxsize=None)
+def _has_simd() -> bool:
+    try:
+        cpuinfo = Path("/proc/cpuinfo").read_text()
+    except OSError:
+        cpuinfo = None
+
+    if cpuinfo is not None:
+        return re.search(r"\b(avx2|asimd)\b", cpuinfo) is not None
+    if platform.machine().lower() in ("arm64", "aarch64"):
+        return True
+
+    # Poza Linuksem (np. macOS na x86) pozostaje prywatna tabela NumPy;
+    # gdy jej zabraknie, hyperscan po prostu nie jest używany.
+    try:
+        from numpy._core._multiarray_umath import __cpu_features__ as features
+    except ImportError:
+        return False
+    return bool(features.get("AVX2"))
+
+
+@lru_cache(maxsize=None)
+def _hyperscan_usable() -> bool:
+    if not HAS_HYPERSCAN:
+        return False
+    if not _has_simd():
+        warnings.warn(
+            "Nie wykryto AVX2/NEON - hyperscan nie będzie używany do wyszukiwania motywów.",
+            RuntimeWarning
+        )
+        return False
+    return True
+
+
+# Wyszukiwanie motywu w długiej sekwencji jest ograniczone mocą obliczeniową
+# (pętla porównań bajtów), natomiast odczyt FASTA i eksport CSV - pamięcią
+# (alokacje obiektów i zapis). Dopasowanie jest więc wybierane dla każdego
+# motywu osobno. Hyperscan, pętla str.find i re wykonują krok Pythona na
+# każde trafienie, dlatego są używane tylko dla rzadkich motywów (górne
+# ograniczenie liczby trafień co najwyżej len(seq) / SPARSE_HIT_RATIO).
+# Gęste motywy - np. w powtórzeniach typu poli-A - obsługują wektorowe
+# porównania NumPy (SWAR, kodowanie 2-bitowe) albo pętla numba.
+def _select_matcher(seq: str, motif: str):
+    if "N" not in motif and len(motif) <= SWAR_WIDTH:
+        return _find_swar
+    if HAS_NUMBA and (os.cpu_count() or 1) > 1:
+        return _find_numba
+
+    if max_motif_hits(seq, motif) * SPARSE_HIT_RATIO <= len(seq):
+        if _hyperscan_usable():
+            return _find_hyperscan
+        if "N" not in motif:
+            return _find_bytes
+
+    if len(motif) <= BASES_PER_WORD:
+        return _find_2bit
+    if HAS_NUMBA:
+        return _find_numba
+    return _find_regex
+
+
+def find_motif_positions(seq: str, motif: str) -> np.ndarray:
+    return np.asarray(_select_matcher(seq, motif)(seq, motif), dtype=np.int64)
+
+
+def segment_counts(seq_len: int, positions0: np.ndarray, bin_size: int) -> pd.DataFrame:
     if bin_size <= 0:
         raise ValueError("Bin size musi być > 0.")
 
     n_bins = max(int(np.ceil(seq_len / bin_size)), 1)
+    positions0 = np.asarray(positions0, dtype=np.int64)
+    shift = int(bin_size).bit_length() - 1 if (bin_size & (bin_size - 1)) == 0 else -1
+
+    if HAS_NUMBA:
+        from numba_kernels import bin_counts
 
-    if not positions0:
-        counts = np.zeros(n_bins, dtype=int)
+        counts = bin_counts(positions0, bin_size, shift, n_bins)
+    elif shift >= 0:
+        counts = np.bincount(positions0 >> shift, minlength=n_bins)
     else:
-        bins = np.array(positions0) // bin_size
-        counts = np.bincount(bins, minlength=n_bins)
+        counts = np.bincount(positions0 // bin_size, minlength=n_bins)
 
     starts = np.arange(n_bins) * bin_size + 1
     ends = np.minimum((np.arange(n_bins) + 1) * bin_size, seq_len)
@@ -212,7 +468,7 @@ def segment_counts(seq_len: int, positions0: List[int], bin_size: int) -> pd.Dat
     })
 
 
-def compute_summary(seq: str, motif: str, positions0: List[int]) -> Dict:
+def compute_summary(seq: str, motif: str, positions0: np.ndarray) -> Dict:
     seq_len = len(seq)
     count = len(positions0)
     density_per_1000 = (count / seq_len * 1000) if seq_len else 0.0
@@ -249,7 +505,7 @@ def analyze_sequence(
     bin_size: int
 ) -> Dict[str, pd.DataFrame]:
     summary_rows = []
-    hits_rows = []
+    hits_frames = []
     bins_frames = []
 
     for motif in motifs:
@@ -267,23 +523,128 @@ def analyze_sequence(
         summary["bin_size"] = bin_size
         summary_rows.append(summary)
 
-        for p in positions0:
-            hits_rows.append({
-                "source_name": source_name,
-                "header": header,
-                "motif": motif,
-                "start_0": p,
-                "start_1": p + 1,
-                "end_1": p + len(motif)
-            })
+        hits_frames.append(pd.DataFrame({
+            "source_name": source_name,
+            "header": header,
+            "motif": motif,
+            "start_0": positions0,
+            "start_1": positions0 + 1,
+            "end_1": positions0 + len(motif)
+        }))
 
     return {
         "summary": pd.DataFrame(summary_rows),
-        "hits": pd.DataFrame(hits_rows),
+        "hits": pd.concat(hits_frames, ignore_index=True) if hits_frames else pd.DataFrame(),
         "bins": pd.concat(bins_frames, ignore_index=True) if bins_frames else pd.DataFrame()
     }
 
 
+# =========================
+# EKSPORT CSV
+# =========================
+
+CSV_KEY_COLUMNS = ["motif"]
+HITS_INT_COLUMNS = ["start_1"]
+BINS_INT_COLUMNS = ["bin_index", "count"]
+CSV_CHUNK_ROWS = 1_000_000
+
+
+def _csv_field(value) -> str:
+    text = str(value)
+    if any(ch in text for ch in ',"\r\n'):
+        text = '"' + text.replace('"', '""') + '"'
+    return text
+
+
+def _csv_int_rows(prefix: bytes, columns: List[np.ndarray]) -> bytes:
+    # Wiersze budowane są jako macierz bajtów: cyfry wyliczane są wektorowo
+    # (divmod przez 10), a zera wiodące zostają bajtami 0 i są usuwane jednym
+    # filtrem - bez tworzenia obiektów Pythona dla każdej wartości.
+    # Niezmienniki: wartości w kolumnach są nieujemne (pozycje, numery binów,
+    # liczności), a prefiks - zakodowane pola tekstowe - nie zawiera bajtu 0,
+    # inaczej filtr usunąłby z wyniku prawdziwe znaki.
+    n_rows = len(columns[0])
+    widths = [len(str(int(c.max()))) for c in columns]
+    rows = np.zeros((n_rows, len(prefix) + sum(widths) + len(columns)), dtype=np.uint8)
+    rows[:, :len(prefix)] = np.frombuffer(prefix, dtype=np.uint8)
+
+    end = len(prefix)
+    for column, width in zip(columns, widths):
+        end += width
+        rest = column.astype(np.uint32 if width < 10 else np.uint64)
+        for k in range(end - 1, end - width - 1, -1):
+            nonzero = rest > 0
+            rest, digit = np.divmod(rest, 10)
+            rows[:, k] = (digit + ord("0")) * nonzero
+        rows[column == 0, end - 1] = ord("0")
+        rows[:, end] = ord(",")
+        end += 1
+
+    rows[:, -1] = ord("\n")
+    return rows[rows != 0].tobytes()
+
+
+def _write_csv_rows_numpy(f, df: pd.DataFrame, key_columns: List[str], int_columns: List[str]):
+    # Wiersze zapisywane są grupami kluczy w kolejności ich pierwszego wystąpienia.
+    # Ramki z analyze_sequence są sklejane motyw po motywie, więc są już
+    # pogrupowane i kolejność zgadza się z to_csv; dla przeplecionych kluczy
+    # wiersze jednego klucza trafiłyby do pliku razem.
+    for keys, group in df.groupby(key_columns, sort=False):
+        prefix = (",".join(_csv_field(k) for k in keys) + ",").encode("utf-8")
+        columns = [group[c].to_numpy(dtype=np.int64) for c in int_columns]
+
+        for lo in range(0, len(group), CSV_CHUNK_ROWS):
+            f.write(_csv_int_rows(prefix, [c[lo:lo + CSV_CHUNK_ROWS] for c in columns]))
+
+
+def _write_csv_rows_pyarrow(f, df: pd.DataFrame, key_columns: List[str], int_columns: List[str]):
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+
+    arrays = [pa.Array.from_pandas(df[c]).cast(pa.string()) for c in key_columns]
+    arrays += [pa.array(df[c].to_numpy(dtype=np.int64)) for c in int_columns]
+    table = pa.Table.from_arrays(arrays, names=key_columns + int_columns)
+    pa_csv.write_csv(table, f, pa_csv.WriteOptions(include_header=False, quoting_style="none"))
+
+
+def write_csv_table(
+    out_path: Path,
+    df: pd.DataFrame,
+    key_columns: List[str],
+    int_columns: List[str]
+):
+    with open(out_path, "wb") as f:
+        f.write((",".join(key_columns + int_columns) + "\n").encode("utf-8"))
+        if df.empty:
+            return
+
+        # pyarrow cytuje każde pole tekstowe, więc pisze bez cudzysłowów, a klucze,
+        # które ich wymagają (przecinek, cudzysłów, nowa linia), przechodzą do
+        # ścieżki NumPy - oba sposoby dają wtedy identyczny plik.
+        plain_keys = all(_csv_field(k) == str(k) for c in key_columns for k in df[c].unique())
+        if plain_keys and importlib.util.find_spec("pyarrow") is not None:
+            _write_csv_rows_pyarrow(f, df, key_columns, int_columns)
+        else:
+            _write_csv_rows_numpy(f, df, key_columns, int_columns)
+
+
+def csv_table_paths(out_dir: Path, n_analyses: int) -> List[Tuple[Path, Path]]:
+    paths = []
+    for i in range(n_analyses):
+        suffix = "" if i == 0 else f"_{i + 1}"
+        paths.append((out_dir / f"hits{suffix}.csv", out_dir / f"bins{suffix}.csv"))
+    return paths
+
+
+def export_csv_tables(out_dir: Path, analyses: List[Dict[str, pd.DataFrame]]) -> List[Path]:
+    written = []
+    for analysis, (hits_path, bins_path) in zip(analyses, csv_table_paths(out_dir, len(analyses))):
+        write_csv_table(hits_path, analysis["hits"], CSV_KEY_COLUMNS, HITS_INT_COLUMNS)
+        write_csv_table(bins_path, analysis["bins"], CSV_KEY_COLUMNS, BINS_INT_COLUMNS)
+        written += [hits_path, bins_path]
+    return written
+
+
 # =========================
 # RAPORT PDF
 # =========================
@@ -295,6 +656,9 @@ def export_pdf_report(
     analysis2: Optional[Dict[str, pd.DataFrame]] = None,
     source2: Optional[str] = None
 ):
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_pdf import PdfPages
+
     def add_table_page(pdf, title: str, df: pd.DataFrame, source_label: str = ""):
         fig = Figure(figsize=(11.69, 8.27))
         ax = fig.add_subplot(111)
@@ -507,6 +871,9 @@ class App(tk.Tk):
 
         self.current_scatter = None
         self.current_points_meta = []
+        self.plot_key = None
+        self.plot_artists = None
+        self.sequence_cache = {}
 
         self._build()
 
@@ -658,6 +1025,12 @@ class App(tk.Tk):
         self.plot_frame.grid_rowconfigure(0, weight=1)
         self.plot_frame.grid_columnconfigure(0, weight=1)
 
+        import matplotlib
+        matplotlib.use("TkAgg")
+
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+
         self.figure = Figure(figsize=(10, 5.5), dpi=100)
         self.ax = self.figure.add_subplot(111)
 
@@ -752,6 +1125,21 @@ class App(tk.Tk):
         except Exception as e:
             messagebox.showerror("Błąd NCBI", str(e))
 
+    def read_sequence_cached(self, slot: str, path: str) -> Tuple[str, str, str]:
+        file_path = Path(path)
+        if not file_path.exists():
+            return read_sequence_file(path)
+
+        stat = file_path.stat()
+        key = (str(file_path.resolve()), stat.st_mtime_ns, stat.st_size)
+
+        # Jeden wpis na pole sekwencji - wybranie innego pliku zwalnia poprzedni.
+        cached = self.sequence_cache.get(slot)
+        if cached is None or cached[0] != key:
+            cached = (key, read_sequence_file(path))
+            self.sequence_cache[slot] = cached
+        return cached[1]
+
     def get_seq1(self):
         return load_sequence(
             source_mode=self.seq1_source_var.get(),
@@ -759,7 +1147,8 @@ class App(tk.Tk):
             accession=self.ncbi1_var.get(),
             email=self.email_var.get(),
             seq_label="sekwencji 1",
-            required=True
+            required=True,
+            file_reader=lambda path: self.read_sequence_cached("seq1", path)
         )
 
     def get_seq2(self):
@@ -769,7 +1158,8 @@ class App(tk.Tk):
             accession=self.ncbi2_var.get(),
             email=self.email_var.get(),
             seq_label="sekwencji 2",
-            required=False
+            required=False,
+            file_reader=lambda path: self.read_sequence_cached("seq2", path)
         )
 
     def run_analysis(self):
@@ -848,45 +1238,106 @@ class App(tk.Tk):
 
     def refresh_plot(self):
         try:
-            self.ax.clear()
-            self.current_scatter = None
-            self.current_points_meta = []
-
             if self.analysis1 is None:
+                self.ax.clear()
+                self.current_scatter = None
+                self.current_points_meta = []
+                self.plot_key = None
+                self.plot_artists = None
                 return
 
             mode = self.plot_mode.get()
             motif = self.selected_motif_var.get()
 
             if mode == PLOT_COMPARISON:
-                self._plot_comparison()
+                series = self._comparison_series()
+                key = (mode, tuple(series[0]), series[2] is not None)
             elif mode == PLOT_SEGMENTATION:
-                self._plot_segmentation(motif)
-            elif mode == PLOT_POSITIONS:
-                self._plot_positions(motif)
+                series = self._segmentation_series(motif)
+                key = (mode, tuple(data is not None for data in series))
+            else:
+                series = None
+                key = None
+
+            rebuilt = key is None or key != self.plot_key
+            if rebuilt:
+                self.ax.clear()
+                self.current_scatter = None
+                self.current_points_meta = []
+                self.plot_artists = None
+
+                if mode == PLOT_COMPARISON:
+                    self.plot_artists = self._plot_comparison(series)
+                elif mode == PLOT_SEGMENTATION:
+                    self.plot_artists = self._plot_segmentation(motif, series)
+                elif mode == PLOT_POSITIONS:
+                    self._plot_positions(motif)
+
+                self.plot_key = key
+            else:
+                self._update_plot(mode, motif, series)
 
             if not self.canvas_visible:
                 self.canvas_widget.grid(row=0, column=0, sticky="nsew")
                 self.canvas_visible = True
                 self.update_idletasks()
 
-            self.figure.tight_layout(rect=[0, 0, 1, 0.95])
+            if rebuilt:
+                self.figure.tight_layout(rect=[0, 0, 1, 0.95])
             self.canvas.draw()
 
         except Exception as e:
             messagebox.showerror("Błąd wykresu", str(e))
 
-    def _plot_comparison(self):
-        s1 = self.analysis1["summary"][["motif", "count"]].copy()
+    def _update_plot(self, mode: str, motif: str, series):
+        if mode == PLOT_COMPARISON:
+            _, counts1, counts2 = series
+            for bars, counts in zip(self.plot_artists, (counts1, counts2)):
+                if bars is None:
+                    continue
+                for rect, height in zip(bars, counts):
+                    rect.set_height(height)
+        elif mode == PLOT_SEGMENTATION:
+            for line, data in zip(self.plot_artists, series):
+                if line is not None:
+                    line.set_data(*data)
+            self.ax.set_title(f"Segmentacja motywu: {motif}")
+
+        self.ax.relim()
+        self.ax.autoscale_view()
+
+    def _comparison_series(self):
+        s1 = self.analysis1["summary"][["motif", "count"]]
         motifs = s1["motif"].tolist()
+
+        counts2 = None
+        if self.analysis2 is not None:
+            s2 = self.analysis2["summary"].set_index("motif").reindex(motifs).fillna(0)
+            counts2 = s2["count"].to_numpy()
+
+        return motifs, s1["count"].to_numpy(), counts2
+
+    def _segmentation_series(self, motif: str):
+        series = []
+        for analysis in (self.analysis1, self.analysis2):
+            data = None
+            if analysis is not None:
+                d = analysis["bins"][analysis["bins"]["motif"] == motif]
+                if not d.empty:
+                    data = (d["start_nt"].to_numpy(), d["count"].to_numpy())
+            series.append(data)
+        return series
+
+    def _plot_comparison(self, series):
+        motifs, counts1, counts2 = series
         x = np.arange(len(motifs))
         width = 0.35
 
-        self.ax.bar(x - width / 2, s1["count"], width=width, label="Sekwencja 1")
+        bars1 = self.ax.bar(x - width / 2, counts1, width=width, label="Sekwencja 1")
 
-        if self.analysis2 is not None:
-            s2 = self.analysis2["summary"].set_index("motif").reindex(motifs).fillna(0)
-            self.ax.bar(x + width / 2, s2["count"], width=width, label="Sekwencja 2")
+        bars2 = None
+        if counts2 is not None:
+            bars2 = self.ax.bar(x + width / 2, counts2, width=width, label="Sekwencja 2")
 
         self.ax.set_xticks(x)
         self.ax.set_xticklabels(motifs)
@@ -896,15 +1347,15 @@ class App(tk.Tk):
         self.ax.legend()
         self.ax.grid(True)
 
-    def _plot_segmentation(self, motif: str):
-        d1 = self.analysis1["bins"][self.analysis1["bins"]["motif"] == motif]
-        if not d1.empty:
-            self.ax.plot(d1["start_nt"], d1["count"], marker="o", label="Sekwencja 1")
+        return bars1, bars2
 
-        if self.analysis2 is not None:
-            d2 = self.analysis2["bins"][self.analysis2["bins"]["motif"] == motif]
-            if not d2.empty:
-                self.ax.plot(d2["start_nt"], d2["count"], marker="o", label="Sekwencja 2")
+    def _plot_segmentation(self, motif: str, series):
+        lines = []
+        for label, data in zip(("Sekwencja 1", "Sekwencja 2"), series):
+            line = None
+            if data is not None:
+                line, = self.ax.plot(*data, marker="o", label=label)
+            lines.append(line)
 
         self.ax.set_xlabel("Pozycja startowa segmentu (nt)")
         self.ax.set_ylabel("Liczba trafień")
@@ -912,6 +1363,8 @@ class App(tk.Tk):
         self.ax.legend()
         self.ax.grid(True)
 
+        return lines
+
     def _plot_positions(self, motif: str):
         x_positions = []
         y_positions = []
@@ -984,11 +1437,116 @@ class App(tk.Tk):
             self.log("Zapisano jeden zbiorczy raport PDF:")
             self.log(str(pdf_path.resolve()))
 
+            analyses = [a for a in (self.analysis1, self.analysis2) if a is not None]
+            existing = [p for pair in csv_table_paths(out_dir, len(analyses)) for p in pair if p.exists()]
+            if existing and not messagebox.askyesno(
+                "Nadpisać pliki CSV?",
+                "W katalogu wyjściowym istnieją już pliki:\n"
+                + "\n".join(p.name for p in existing)
+                + "\n\nCzy nadpisać je nowymi wynikami?"
+            ):
+                self.log("Pominięto zapis tabel CSV.")
+            else:
+                csv_paths = export_csv_tables(out_dir, analyses)
+                self.log("Zapisano tabele CSV:")
+                for csv_path in csv_paths:
+                    self.log(str(csv_path.resolve()))
+
             messagebox.showinfo("Eksport zakończony", f"Raport PDF zapisano tutaj:\n{pdf_path.resolve()}")
 
         except Exception as e:
             messagebox.showerror("Błąd eksportu", str(e))
 
 
+# =========================
+# URUCHOMIENIE
+# =========================
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="DNA Motif Analyzer. Bez podania plików uruchamiane jest GUI."
+    )
+    parser.add_argument("fasta", nargs="*", help="jeden lub dwa pliki FASTA/TXT do analizy")
+    parser.add_argument("--motifs", help=f"motywy po przecinku (domyślnie {DEFAULT_MOTIFS})")
+    parser.add_argument("--bin-size", type=int, help=f"rozmiar binu w nt (domyślnie {DEFAULT_BIN_SIZE})")
+    parser.add_argument("--out-dir", help="katalog wyników (domyślnie output/ obok pierwszego pliku)")
+    parser.add_argument(
+        "--plot",
+        action=argparse.BooleanOptionalAction,
+        default=None,
+        help="zapisz raport PDF z wykresami (domyślnie tylko w terminalu interaktywnym)"
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        default=None,
+        help="nadpisz istniejące pliki hits.csv/bins.csv w katalogu wyników"
+    )
+
+    args = parser.parse_args(argv)
+    if len(args.fasta) > 2:
+        parser.error("Można porównać najwyżej dwie sekwencje.")
+
+    batch_options = {
+        "--motifs": args.motifs,
+        "--bin-size": args.bin_size,
+        "--out-dir": args.out_dir,
+        "--plot/--no-plot": args.plot,
+        "--force": args.force
+    }
+    given = [name for name, value in batch_options.items() if value is not None]
+    if given and not args.fasta:
+        parser.error(f"Opcje {', '.join(given)} wymagają podania pliku FASTA (tryb wsadowy).")
+
+    if args.motifs is None:
+        args.motifs = DEFAULT_MOTIFS
+    if args.bin_size is None:
+        args.bin_size = int(DEFAULT_BIN_SIZE)
+    return args
+
+
+def main(argv: Optional[List[str]] = None):
+    args = parse_args(argv)
+
+    if not args.fasta:
+        App().mainloop()
+        return
+
+    try:
+        out_dir = Path(args.out_dir) if args.out_dir else Path(args.fasta[0]).resolve().parent / "output"
+        existing = [p for pair in csv_table_paths(out_dir, len(args.fasta)) for p in pair if p.exists()]
+        if existing and not args.force:
+            raise ValueError(
+                f"W katalogu {out_dir} istnieją już pliki {', '.join(p.name for p in existing)}. "
+                "Podaj inny --out-dir albo użyj --force, aby je nadpisać."
+            )
+
+        motifs = normalize_motifs(args.motifs)
+        sequences = [read_sequence_file(path) for path in args.fasta]
+        analyses = [analyze_sequence(*seq, motifs, args.bin_size) for seq in sequences]
+        out_dir.mkdir(parents=True, exist_ok=True)
+
+        for analysis in analyses:
+            print(analysis["summary"][["source_name", "motif", "count", "density_per_1000nt"]].to_string(index=False))
+
+        for csv_path in export_csv_tables(out_dir, analyses):
+            print(csv_path.resolve())
+
+        plot = sys.stdout.isatty() if args.plot is None else args.plot
+        if plot:
+            pdf_path = out_dir / f"motif_report_{int(time.time())}.pdf"
+            export_pdf_report(
+                out_path=pdf_path,
+                analysis1=analyses[0],
+                source1=sequences[0][0],
+                analysis2=analyses[1] if len(analyses) > 1 else None,
+                source2=sequences[1][0] if len(sequences) > 1 else None
+            )
+            print(pdf_path.resolve())
+
+    except ValueError as e:
+        sys.exit(f"Błąd: {e}")
+
+
 if __name__ == "__main__":
-    App().mainloop()
+    main()
@@ -0,0 +1,52 @@
+import numba
+import numpy as np
+
+# Jądra numba są w osobnym module, importowanym z main.py dopiero przy
+# pierwszym wyszukiwaniu - sam import numba wydłuża start programu.
+
+N_BYTE = ord("N")
+
+
+@numba.njit(cache=True)
+def motif_at(arr, motif, i):
+    for j in range(motif.size):
+        if motif[j] != N_BYTE and arr[i + j] != motif[j]:
+            return False
+    return True
+
+
+@numba.njit(parallel=True, cache=True)
+def scan_chunks(arr, motif, bounds):
+    n_chunks = bounds.size - 1
+
+    counts = np.zeros(n_chunks, dtype=np.int64)
+    for c in numba.prange(n_chunks):
+        found = 0
+        for i in range(bounds[c], bounds[c + 1]):
+            if motif_at(arr, motif, i):
+                found += 1
+        counts[c] = found
+
+    offsets = np.zeros(n_chunks + 1, dtype=np.int64)
+    offsets[1:] = np.cumsum(counts)
+
+    positions = np.empty(offsets[-1], dtype=np.int64)
+    for c in numba.prange(n_chunks):
+        k = offsets[c]
+        for i in range(bounds[c], bounds[c + 1]):
+            if motif_at(arr, motif, i):
+                positions[k] = i
+                k += 1
+    return positions
+
+
+@numba.njit(cache=True)
+def bin_counts(positions0, bin_size, shift, n_bins):
+    counts = np.zeros(n_bins, dtype=np.int64)
+    if shift >= 0:
+        for i in range(positions0.size):
+            counts[positions0[i] >> shift] += 1
+    else:
+        for i in range(positions0.size):
+            counts[positions0[i] // bin_size] += 1
+    return counts